@@ -4,6 +4,9 @@ E-Commerce Growth Intelligence Tool
 Tab router, data pipeline orchestration, and UI rendering.
 """
 
+import hashlib
+import importlib
+import pandas as pd
 import streamlit as st
 import sample_data
 from modules import uploader
@@ -11,16 +14,16 @@ from modules import schema_detection
 from modules import data_cleaning
 from modules import aggregation
 from modules import kpi_engine
-from modules import growth_quality
-from modules import unit_economics
-from modules import segment_analysis
-from modules import cohort_analysis
-from modules import seasonality
-from modules import cagr
-from modules import visualization as viz
+from modules.fingerprint import fingerprint
 from modules.load_image import img_to_base64
 
 
+#  Pandas Copy-on-Write 
+# Derived frames share buffers until written, so pipeline steps don't
+# pay for defensive full-frame copies.
+pd.set_option("mode.copy_on_write", True)
+
+
 #  Page Config 
 st.set_page_config(
     page_title="E-Commerce Growth Intelligence",
@@ -31,22 +34,88 @@ st.set_page_config(
 
 
 #  Load External CSS 
-def load_css(file_path):
-    """Load and inject CSS from an external file."""
+@st.cache_data(show_spinner=False)
+def _read_css(file_path):
+    """Read a CSS file once per process; returns None if it is missing."""
     try:
         with open(file_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+            return f.read()
     except FileNotFoundError:
-        pass
+        return None
+
+
+def load_css(file_path):
+    """Load and inject CSS from an external file."""
+    css = _read_css(file_path)
+    if css is not None:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+@st.cache_data(show_spinner=False)
+def _profile_image(path):
+    """Cached base64 encoding of the sidebar profile image."""
+    return img_to_base64(path)
 
 
 load_css("assets/styles.css")
 
 
+#  Cached Pipeline Steps 
+# Streamlit reruns the whole script on every interaction; these wrappers
+# memoize the pure pipeline functions so unchanged data is not reprocessed.
+@st.cache_data(show_spinner=False)
+def _parse_upload(_uploaded_file, file_key):
+    """Parse an uploaded file, cached on its name and full-content digest."""
+    return uploader.parse_file(_uploaded_file)
+
+
+@st.cache_data(show_spinner=False)
+def _build_mapping(columns):
+    """Cached schema_detection.build_mapping(), keyed on the column names."""
+    return schema_detection.build_mapping(columns)
+
+
+# DataFrames are keyed on a vectorized content fingerprint (schema plus a
+# digest of every row) instead of Streamlit's generic frame hashing.
+_FRAME_HASH = {pd.DataFrame: fingerprint}
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_HASH)
+def _clean(df):
+    """Cached data_cleaning.clean()."""
+    return data_cleaning.clean(df)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_HASH)
+def _monthly(df):
+    """Cached aggregation.build_monthly_summary()."""
+    return aggregation.build_monthly_summary(df)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_HASH)
+def _kpis(clean_df, monthly_df):
+    """Cached kpi_engine.compute_kpis()."""
+    return kpi_engine.compute_kpis(clean_df, monthly_df)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_HASH)
+def _chart(factory, df, **kwargs):
+    """Cached visualization.<factory>(df, ...); figures are rebuilt only on new data."""
+    from modules import visualization as viz
+    return getattr(viz, factory)(df, **kwargs)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=_FRAME_HASH)
+def _analyze(module_name, clean_df, monthly_df, kpis):
+    """Cached analyze() of a tab module; the module is imported on first use."""
+    module = importlib.import_module(f"modules.{module_name}")
+    return module.analyze(clean_df, monthly_df, kpis)
+
+
 #  Sidebar: Profile + Uploader 
 with st.sidebar:
     # Profile section
-    img_base64 = img_to_base64("assets/me.jpg")
+    img_base64 = _profile_image("assets/me.jpg")
     if img_base64:
         st.markdown(
             f'<div style="text-align:center; padding: 1rem 0;">'
@@ -80,7 +149,12 @@ with st.sidebar:
     data_source = ""
 
     if uploaded_file is not None:
-        df, status_msg = uploader.parse_file(uploaded_file)
+        # Digest of every byte: an edited re-upload never hits a stale entry
+        file_key = (
+            uploaded_file.name,
+            hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest(),
+        )
+        df, status_msg = _parse_upload(uploaded_file, file_key)
         if df is not None:
             data_source = "uploaded"
             st.success("📁 **Using Uploaded Dataset**")
@@ -114,7 +188,8 @@ with st.expander("👀 Data Preview", expanded=False):
 
 
 #  Schema Detection 
-mapped_df, mapping, missing_required = schema_detection.detect_and_map(df)
+norm_columns, rename_map, mapping, missing_required = _build_mapping(tuple(df.columns))
+mapped_df = schema_detection.apply_mapping(df, norm_columns, rename_map)
 
 mapping_report = schema_detection.format_mapping_report(mapping, missing_required)
 with st.expander("🗺️ Column Mapping Summary", expanded=False):
@@ -132,7 +207,7 @@ if missing_required:
 
 
 #  Data Cleaning 
-clean_df, cleaning_report = data_cleaning.clean(mapped_df)
+clean_df, cleaning_report = _clean(mapped_df)
 
 cleaning_messages = data_cleaning.format_cleaning_report(cleaning_report)
 with st.expander("🧹 Data Cleaning Report", expanded=False):
@@ -148,8 +223,8 @@ if clean_df.empty:
 
 
 #  Aggregation & KPIs 
-monthly_df = aggregation.build_monthly_summary(clean_df)
-kpis = kpi_engine.compute_kpis(clean_df, monthly_df)
+monthly_df = _monthly(clean_df)
+kpis = _kpis(clean_df, monthly_df)
 
 
 #  Helpers 
@@ -173,16 +248,16 @@ def render_insights(insights):
         st.info(insight)
 
 
-def render_tab(module, tab_name, *args, **kwargs):
+def render_tab(analyze, tab_name, *args, **kwargs):
     """Safely render a tab's content from a module's analyze function."""
     try:
-        result = module.analyze(*args, **kwargs)
+        result = analyze(*args, **kwargs)
 
         if result.get("kpis"):
             render_kpi_cards(result["kpis"])
 
-        for chart in result.get("charts", []):
-            st.plotly_chart(chart, width="stretch")
+        for i, chart in enumerate(result.get("charts", [])):
+            st.plotly_chart(chart, key=f"{tab_name}_chart_{i}", width="stretch")
 
         if result.get("insights"):
             st.markdown("### 💡 Business Insights")
@@ -208,6 +283,8 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
 
 
 #  Tab 1: Overview 
+# Analytics modules (and plotly via visualization) are imported on first
+# use so they load only once the pipeline above succeeds.
 with tab1:
     st.markdown("## Top-Line Growth Overview")
 
@@ -230,31 +307,34 @@ with tab1:
 
     if not monthly_df.empty:
         st.plotly_chart(
-            viz.line_chart(
-                monthly_df, x="year_month", y="total_revenue",
+            _chart(
+                "line_chart", monthly_df, x="year_month", y="total_revenue",
                 title="Monthly Revenue Trend",
                 y_label="Revenue (₹)",
             ),
+            key="overview_revenue_trend",
             width="stretch",
         )
 
         col1, col2 = st.columns(2)
         with col1:
             st.plotly_chart(
-                viz.bar_chart(
-                    monthly_df, x="year_month", y="total_orders",
+                _chart(
+                    "bar_chart", monthly_df, x="year_month", y="total_orders",
                     title="Monthly Orders",
                     y_label="Orders",
                 ),
+                key="overview_orders",
                 width="stretch",
             )
         with col2:
             st.plotly_chart(
-                viz.bar_chart(
-                    monthly_df, x="year_month", y="unique_customers",
+                _chart(
+                    "bar_chart", monthly_df, x="year_month", y="unique_customers",
                     title="Monthly Unique Customers",
                     y_label="Customers",
                 ),
+                key="overview_customers",
                 width="stretch",
             )
 
@@ -283,27 +363,31 @@ with tab1:
 #  Tab 2–7 
 with tab2:
     st.markdown("## Growth Quality Analysis")
-    render_tab(growth_quality, "Growth Quality", clean_df, monthly_df, kpis)
+    render_tab(_analyze, "Growth Quality", "growth_quality", clean_df, monthly_df, kpis)
 
 with tab3:
     st.markdown("## Unit Economics")
-    render_tab(unit_economics, "Unit Economics", clean_df, monthly_df, kpis)
+    render_tab(_analyze, "Unit Economics", "unit_economics", clean_df, monthly_df, kpis)
 
 with tab4:
     st.markdown("## Segment Analysis")
-    render_tab(segment_analysis, "Segment Analysis", clean_df, monthly_df, kpis)
+    render_tab(_analyze, "Segment Analysis", "segment_analysis", clean_df, monthly_df, kpis)
 
 with tab5:
     st.markdown("## Cohort Analysis")
-    render_tab(cohort_analysis, "Cohort Analysis", clean_df, monthly_df, kpis)
+    render_tab(_analyze, "Cohort Analysis", "cohort_analysis", clean_df, monthly_df, kpis)
 
 with tab6:
     st.markdown("## Seasonality & Patterns")
-    render_tab(seasonality, "Seasonality", clean_df, monthly_df, kpis)
+    render_tab(_analyze, "Seasonality", "seasonality", clean_df, monthly_df, kpis)
 
 with tab7:
     st.markdown("## CAGR & Investor View")
-    render_tab(cagr, "CAGR & Investor View", clean_df, monthly_df, kpis)
+    if len(monthly_df) < 2:
+        # Decided here so the cagr module never loads for under two months of data
+        render_insights(["📊 Need at least 2 months of data to calculate CAGR."])
+    else:
+        render_tab(_analyze, "CAGR & Investor View", "cagr", clean_df, monthly_df, kpis)
 
 
 #  Footer 
@@ -59,6 +59,11 @@ COLUMN_ALIASES = {
     ],
 }
 
+#  CSV Reading 
+# Uploads at least this large use pyarrow's multi-threaded CSV reader when
+# pyarrow is installed; set to None to always use pandas.read_csv.
+ARROW_CSV_MIN_BYTES = 1_000_000
+
 #  Currency Symbols to Strip 
 CURRENCY_SYMBOLS = ["₹", "$", "€", "£", "¥", ","]
 
@@ -80,6 +85,9 @@ DATE_FORMATS = [
 CHART_TEMPLATE = "plotly_white"
 CHART_HEIGHT = 350
 
+# Line series longer than this are LTTB-downsampled before plotting
+MAX_LINE_POINTS = 500
+
 CHART_COLORS = [
     "#636EFA",  # Blue
     "#EF553B",  # Red
@@ -4,8 +4,8 @@ Produces reusable summary DataFrames for all analytics modules.
 Pure function — no Streamlit calls.
 """
 
+import numpy as np
 import pandas as pd
-from config import safe_divide
 
 
 def build_monthly_summary(df):
@@ -21,10 +21,11 @@ def build_monthly_summary(df):
     if "year_month" not in df.columns or df.empty:
         return pd.DataFrame()
 
+    customer_col = _customer_key(df)
     agg_dict = {
         "revenue": "sum",
         "order_id": "count",
-        "customer_id": "nunique",
+        customer_col: "nunique",
     }
 
     # Include cost if available
@@ -36,16 +37,19 @@ def build_monthly_summary(df):
         agg_dict["marketing_spend"] = "sum"
 
     monthly = (
-        df.groupby("year_month", sort=True)
+        df.groupby("year_month", sort=False, observed=True)
         .agg(agg_dict)
         .reset_index()
     )
+    # clean() emits rows in date order, so this sort is normally skipped
+    if not monthly["year_month"].is_monotonic_increasing:
+        monthly = monthly.sort_values("year_month", ignore_index=True)
 
     # Rename columns
     rename_map = {
         "revenue": "total_revenue",
         "order_id": "total_orders",
-        "customer_id": "unique_customers",
+        customer_col: "unique_customers",
     }
     if "cost" in monthly.columns:
         rename_map["cost"] = "total_cost"
@@ -55,9 +59,8 @@ def build_monthly_summary(df):
     monthly = monthly.rename(columns=rename_map)
 
     # Compute AOV
-    monthly["avg_order_value"] = monthly.apply(
-        lambda r: round(safe_divide(r["total_revenue"], r["total_orders"]), 2),
-        axis=1,
+    monthly["avg_order_value"] = _avg_order_value(
+        monthly["total_revenue"], monthly["total_orders"]
     )
 
     return monthly
@@ -78,31 +81,33 @@ def build_segment_summary(df, segment_col):
     if segment_col not in df.columns or df.empty:
         return pd.DataFrame()
 
+    customer_col = _customer_key(df)
     agg_dict = {
         "revenue": "sum",
         "order_id": "count",
-        "customer_id": "nunique",
+        customer_col: "nunique",
     }
 
     segment = (
-        df.groupby(segment_col, sort=True)
+        df.groupby(segment_col, sort=False, observed=True)
         .agg(agg_dict)
         .reset_index()
         .rename(columns={
             segment_col: "segment",
             "revenue": "total_revenue",
             "order_id": "total_orders",
-            "customer_id": "unique_customers",
+            customer_col: "unique_customers",
         })
     )
 
-    segment["avg_order_value"] = segment.apply(
-        lambda r: round(safe_divide(r["total_revenue"], r["total_orders"]), 2),
-        axis=1,
+    segment["avg_order_value"] = _avg_order_value(
+        segment["total_revenue"], segment["total_orders"]
     )
 
-    # Sort by revenue descending
-    segment = segment.sort_values("total_revenue", ascending=False).reset_index(drop=True)
+    # Sort by revenue descending (ties by segment name)
+    segment = segment.sort_values(
+        ["total_revenue", "segment"], ascending=[False, True], ignore_index=True
+    )
 
     return segment
 
@@ -120,9 +125,10 @@ def build_daily_summary(df):
         return pd.DataFrame()
 
     daily = (
-        df.groupby("date", sort=True)
+        df.groupby("date", sort=False)
         .agg({"revenue": "sum", "order_id": "count"})
         .reset_index()
+        .sort_values("date", ignore_index=True)
         .rename(columns={
             "revenue": "daily_revenue",
             "order_id": "daily_orders",
@@ -130,3 +136,16 @@ def build_daily_summary(df):
     )
 
     return daily
+
+
+def _customer_key(df):
+    """Column to count distinct customers on: factorized codes when present."""
+    return "customer_code" if "customer_code" in df.columns else "customer_id"
+
+
+def _avg_order_value(revenue, orders):
+    """Vectorized revenue / orders, rounded to 2 decimals (0.0 where orders is 0)."""
+    rev = revenue.to_numpy(dtype=float)
+    cnt = orders.to_numpy(dtype=float)
+    aov = np.divide(rev, cnt, out=np.zeros_like(rev), where=cnt != 0)
+    return np.round(aov, 2)
@@ -69,8 +69,10 @@ def analyze(clean_df, monthly_df, kpis):
         )
 
     # ─── Cumulative Revenue Chart ────────────────────────────────────────
-    cum_df = monthly_df.copy()
-    cum_df["cumulative_revenue"] = cum_df["total_revenue"].cumsum()
+    cum_df = pd.DataFrame({
+        "year_month": monthly_df["year_month"].array,
+        "cumulative_revenue": monthly_df["total_revenue"].to_numpy().cumsum(),
+    })
     result["charts"].append(
         viz.line_chart(
             cum_df, x="year_month", y="cumulative_revenue",
@@ -140,36 +142,25 @@ def _project_revenue(monthly_df, months_ahead=3):
     if len(monthly_df) < 2:
         return pd.DataFrame()
 
-    try:
-        # Simple linear regression on monthly revenue
-        y = monthly_df["total_revenue"].values
-        x = np.arange(len(y))
-
-        # Fit line: y = mx + b
-        coeffs = np.polyfit(x, y, 1)
-        slope, intercept = coeffs[0], coeffs[1]
-
-        # Historical data
-        hist = pd.DataFrame({
-            "year_month": monthly_df["year_month"].values,
-            "revenue": y,
-            "type": "Actual",
-        })
-
-        # Projected data
-        last_month = pd.Period(monthly_df.iloc[-1]["year_month"], freq="M")
-        proj_months = [(last_month + i + 1).strftime("%Y-%m") for i in range(months_ahead)]
-        proj_x = np.arange(len(y), len(y) + months_ahead)
-        proj_y = slope * proj_x + intercept
-        proj_y = np.maximum(proj_y, 0)  # No negative projections
-
-        proj = pd.DataFrame({
-            "year_month": proj_months,
-            "revenue": proj_y.round(2),
-            "type": "Projected",
-        })
-
-        return pd.concat([hist, proj], ignore_index=True)
-
-    except Exception:
-        return pd.DataFrame()
+    # Simple linear regression on monthly revenue
+    y = monthly_df["total_revenue"].to_numpy(dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64)
+
+    # Fit line: y = mx + b (closed-form least squares)
+    x_mean, y_mean = x.mean(), y.mean()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / ((x - x_mean) ** 2).sum()
+    intercept = y_mean - slope * x_mean
+
+    # Projected data
+    hist_months = pd.PeriodIndex(monthly_df["year_month"])
+    proj_months = pd.period_range(hist_months[-1] + 1, periods=months_ahead, freq="M")
+    proj_x = np.arange(len(y), len(y) + months_ahead)
+    proj_y = slope * proj_x + intercept
+    proj_y = np.maximum(proj_y, 0)  # No negative projections
+
+    # Historical + projected rows in a single frame
+    return pd.DataFrame({
+        "year_month": hist_months.append(proj_months),
+        "revenue": np.concatenate([y, proj_y.round(2)]),
+        "type": ["Actual"] * len(y) + ["Projected"] * months_ahead,
+    })
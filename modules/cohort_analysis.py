@@ -5,7 +5,6 @@ Tracks customer cohorts by first-purchase month and their retention.
 
 import pandas as pd
 import numpy as np
-from config import safe_divide
 from modules import visualization as viz
 
 
@@ -27,49 +26,43 @@ def analyze(clean_df, monthly_df, kpis):
         return result
 
     # ─── Build cohort data ───────────────────────────────────────────────
-    # Find each customer's first purchase month (cohort)
-    cohort_map = (
-        clean_df.groupby("customer_id")["year_month"]
-        .min()
-        .reset_index()
-        .rename(columns={"year_month": "cohort"})
+    # Find each customer's first purchase month (cohort). transform keeps
+    # the Period dtype even when customer_id is categorical.
+    df = clean_df.assign(
+        cohort=clean_df.groupby("customer_id", sort=False, observed=True)["year_month"]
+        .transform("min")
     )
 
-    df = clean_df.merge(cohort_map, on="customer_id", how="left")
-
-    # Unique months sorted
-    all_months = sorted(df["year_month"].unique())
-    month_index = {m: i for i, m in enumerate(all_months)}
-
-    # Calculate months since cohort
-    df["cohort_index"] = df.apply(
-        lambda r: month_index.get(r["year_month"], 0) - month_index.get(r["cohort"], 0),
-        axis=1,
-    )
+    # Calculate months since cohort (difference of monthly Period ordinals)
+    df["cohort_index"] = (
+        df["year_month"].array.asi8 - df["cohort"].array.asi8
+    ).astype("int32")
 
     # ─── Retention matrix ────────────────────────────────────────────────
+    # One pass over df feeds both the retention matrix and cohort revenue
+    customer_col = "customer_code" if "customer_code" in df.columns else "customer_id"
     cohort_data = (
-        df.groupby(["cohort", "cohort_index"])["customer_id"]
-        .nunique()
-        .reset_index()
-        .rename(columns={"customer_id": "customers"})
+        df.groupby(["cohort", "cohort_index"], sort=False, observed=True)
+        .agg(customers=(customer_col, "nunique"), revenue=("revenue", "sum"))
     )
 
     # Pivot to matrix
-    cohort_pivot = cohort_data.pivot_table(
-        index="cohort", columns="cohort_index", values="customers", fill_value=0
-    )
-
-    # Cohort sizes (month 0)
-    cohort_sizes = cohort_pivot[0] if 0 in cohort_pivot.columns else pd.Series(dtype=float)
+    cohort_pivot = cohort_data["customers"].unstack(fill_value=0)
 
-    # Calculate retention percentages
-    retention = cohort_pivot.copy()
-    for col in retention.columns:
-        retention[col] = retention.apply(
-            lambda r: round(safe_divide(r[col], cohort_sizes.get(r.name, 1)) * 100, 1),
-            axis=1,
-        )
+    # Cohort sizes (month 0); zero-sized cohorts become NaN and then 0%
+    piv = cohort_pivot.to_numpy(dtype=np.float64)
+    if 0 in cohort_pivot.columns:
+        sizes = cohort_pivot[0].to_numpy(dtype=np.float64, copy=True)
+    else:
+        sizes = np.ones(len(cohort_pivot))
+    sizes[sizes == 0] = np.nan
+
+    # Calculate retention percentages (one broadcast over the whole pivot)
+    retention = pd.DataFrame(
+        np.nan_to_num(np.round(piv / sizes[:, None] * 100, 1)),
+        index=cohort_pivot.index,
+        columns=cohort_pivot.columns,
+    )
 
     # ─── KPIs ────────────────────────────────────────────────────────────
     num_cohorts = len(cohort_pivot)
@@ -86,9 +79,9 @@ def analyze(clean_df, monthly_df, kpis):
 
     # ─── Heatmap ─────────────────────────────────────────────────────────
     if not retention.empty and len(retention.columns) > 1:
-        z_values = retention.values.tolist()
+        z_values = retention.to_numpy()
         x_labels = [f"M+{int(c)}" for c in retention.columns]
-        y_labels = retention.index.tolist()
+        y_labels = retention.index.astype(str).tolist()
 
         result["charts"].append(
             viz.heatmap(
@@ -100,11 +93,11 @@ def analyze(clean_df, monthly_df, kpis):
 
     # ─── Cohort Revenue ──────────────────────────────────────────────────
     cohort_revenue = (
-        df.groupby("cohort")["revenue"]
+        cohort_data["revenue"]
+        .groupby(level="cohort", sort=True)
         .sum()
         .reset_index()
         .rename(columns={"revenue": "total_revenue"})
-        .sort_values("cohort")
     )
     if not cohort_revenue.empty:
         result["charts"].append(
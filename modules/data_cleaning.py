@@ -5,10 +5,30 @@ Pure function — no Streamlit calls.
 """
 
 import re
+import string
 import pandas as pd
 import numpy as np
 import config
 
+try:
+    import pyarrow as pa  # enables Arrow-backed column dtypes
+    import pyarrow.compute as pc
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Leading YYYY-MM-DD: such columns are parsed with format="ISO8601"
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# Plausible Unix-epoch seconds for order dates (2001-09 to 2096-10)
+_EPOCH_SECONDS_RANGE = (1_000_000_000, 4_000_000_000)
+
+# Currency symbols, thousands separators and whitespace stripped before parsing
+_NUMERIC_STRIP_CHARS = "".join(config.CURRENCY_SYMBOLS) + string.whitespace + "\xa0\u2009\u202f"
+_NUMERIC_STRIP = str.maketrans("", "", _NUMERIC_STRIP_CHARS)
+# Same set as an RE2 character class for Arrow's regex kernel, built once
+_NUMERIC_STRIP_PATTERN = "[" + "".join(f"\\x{{{ord(c):x}}}" for c in _NUMERIC_STRIP_CHARS) + "]"
+
 
 def clean(df):
     """Clean and standardize the DataFrame.
@@ -31,22 +51,28 @@ def clean(df):
         "text_normalized": 0,
     }
 
-    df = df.copy()
+    # Shallow copy: every step below assigns whole columns or builds a new
+    # frame, so the caller's data is never written and no buffers are cloned.
+    df = df.copy(deep=False)
 
     # ─── Step 1: Remove duplicates on order_id ───────────────────────────
     if "order_id" in df.columns:
-        before = len(df)
-        df = df.drop_duplicates(subset=["order_id"], keep="first")
-        report["duplicates_removed"] = before - len(df)
+        # Hash only the key column; rows are taken once, and only if needed
+        dup = df["order_id"].duplicated(keep="first").to_numpy()
+        report["duplicates_removed"] = int(dup.sum())
+        if report["duplicates_removed"]:
+            df = df[~dup]
 
     # ─── Step 2: Convert date column ─────────────────────────────────────
     if "date" in df.columns:
         df["date"], invalid_count = _convert_dates(df["date"])
         report["invalid_dates"] = invalid_count
-        # Drop rows with no valid date
-        null_dates = df["date"].isna().sum()
-        df = df.dropna(subset=["date"])
-        report["null_rows_dropped"] += null_dates
+        # Drop rows with no valid date (one mask serves count and filter)
+        null_dates = df["date"].isna().to_numpy()
+        null_count = int(np.count_nonzero(null_dates))
+        if null_count:
+            df = df[~null_dates]
+        report["null_rows_dropped"] += null_count
 
     # ─── Step 3: Clean numeric columns (revenue, cost, marketing_spend) ─
     numeric_cols = ["revenue", "cost", "marketing_spend"]
@@ -54,10 +80,11 @@ def clean(df):
         if col in df.columns:
             df[col] = _clean_numeric(df[col])
 
-    # Track invalid revenue
+    # Track invalid revenue (both counts from one float array)
     if "revenue" in df.columns:
-        report["invalid_revenue"] = int(df["revenue"].isna().sum())
-        report["negative_revenue"] = int((df["revenue"] < 0).sum())
+        rev = df["revenue"].to_numpy(dtype=np.float64, na_value=np.nan)
+        report["invalid_revenue"] = int(np.count_nonzero(np.isnan(rev)))
+        report["negative_revenue"] = int(np.count_nonzero(rev < 0))
 
     # ─── Step 4: Drop rows where ALL required fields are null ────────────
     required_present = [c for c in config.REQUIRED_COLUMNS if c in df.columns]
@@ -73,20 +100,46 @@ def clean(df):
             df[col] = df[col].fillna(0)
 
     # ─── Step 6: Normalize text columns ──────────────────────────────────
+    # Stored as category so segment groupbys hash small integer codes
     text_count = 0
     for col in config.TEXT_COLUMNS:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip().str.lower()
-            # Replace 'nan' strings from astype conversion
-            df[col] = df[col].replace("nan", "unknown")
+            df[col] = _normalize_text(df[col])
             text_count += 1
     report["text_normalized"] = text_count
 
     # ─── Step 7: Add year_month column for aggregation ───────────────────
+    # Kept as a monthly Period dtype (int64 ordinals) so downstream modules
+    # can sort and subtract months without string parsing.
     if "date" in df.columns:
-        df["year_month"] = df["date"].dt.to_period("M").astype(str)
-
-    # ─── Step 8: Reset index ─────────────────────────────────────────────
+        df["year_month"] = df["date"].dt.to_period("M")
+        # Rows are put in date order once here, so per-month groupbys with
+        # sort=False already come out chronological downstream.
+        if not df["date"].is_monotonic_increasing:
+            df = df.sort_values("date", kind="stable")
+
+    # ─── Step 8: Factorize customer_id into integer codes ────────────────
+    # Distinct-customer counts group on these codes instead of hashing the
+    # original ids again; missing ids stay missing (nullable Int32).
+    if "customer_id" in df.columns:
+        codes, uniques = pd.factorize(df["customer_id"])
+        df["customer_code"] = pd.arrays.IntegerArray(codes.astype("int32"), codes < 0)
+        # Repeat-heavy id columns become categorical, reusing the same codes
+        if len(uniques) <= len(df) // 2:
+            df["customer_id"] = pd.Categorical.from_codes(codes, categories=uniques)
+
+    # ─── Step 9: Arrow-backed storage (when pyarrow is installed) ────────
+    # Arrow kernels handle the sums / nunique calls downstream; categorical
+    # customer ids from Step 8 are left as they are.
+    if _HAS_PYARROW:
+        for col in ["revenue", "cost", "marketing_spend"]:
+            if col in df.columns:
+                df[col] = df[col].astype("float64[pyarrow]")
+        for col in ["order_id", "customer_id"]:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("string[pyarrow]")
+
+    # ─── Step 10: Reset index ────────────────────────────────────────────
     df = df.reset_index(drop=True)
     report["final_rows"] = len(df)
 
@@ -134,42 +187,114 @@ def format_cleaning_report(report):
 def _convert_dates(series):
     """Convert a series to datetime, trying multiple formats.
 
+    Each distinct raw value is parsed once and scattered back to the rows,
+    so exports with many repeated date strings avoid re-parsing them.
+
     Returns:
         tuple: (converted_series, count_of_invalid)
     """
-    # First try pandas auto-detection
-    converted = pd.to_datetime(series, errors="coerce", infer_datetime_format=True)
-
-    # Count invalids
-    invalid_count = int(converted.isna().sum() - series.isna().sum())
-    if invalid_count < 0:
-        invalid_count = 0
+    # Already typed (e.g. parsed by the reader): nothing to convert
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series, 0
+
+    # Integer columns in the epoch-seconds / -milliseconds range
+    if pd.api.types.is_integer_dtype(series):
+        unit = _epoch_unit(series)
+        if unit is not None:
+            converted = pd.to_datetime(series, unit=unit, errors="coerce")
+            failed = converted.isna().to_numpy() & series.notna().to_numpy()
+            return converted, int(np.count_nonzero(failed))
+
+    codes, uniques = pd.factorize(series)
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    # First try pandas auto-detection (ISO strings take the fast path)
+    first = uniques[0] if len(uniques) else None
+    if isinstance(first, str) and _ISO_DATE_RE.match(first):
+        parsed = pd.to_datetime(uniques, errors="coerce", format="ISO8601")
+    else:
+        parsed = pd.to_datetime(uniques, errors="coerce")
 
     # If too many NaTs, try explicit formats
-    nat_ratio = converted.isna().sum() / max(len(series), 1)
+    valid_rows = row_counts[parsed.notna()].sum()
+    nat_ratio = 1 - valid_rows / max(len(series), 1)
     if nat_ratio > 0.5:
         for fmt in config.DATE_FORMATS:
             try:
-                attempt = pd.to_datetime(series, format=fmt, errors="coerce")
-                if attempt.notna().sum() > converted.notna().sum():
-                    converted = attempt
+                attempt = pd.to_datetime(uniques, format=fmt, errors="coerce")
+                attempt_rows = row_counts[attempt.notna()].sum()
+                if attempt_rows > valid_rows:
+                    parsed, valid_rows = attempt, attempt_rows
             except Exception:
                 continue
 
-    invalid_count = max(0, int(converted.isna().sum() - series.isna().sum()))
+    converted = pd.Series(
+        pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=series.index,
+        name=series.name,
+    )
+    # Rows that had a value but did not parse, counted over the uniques
+    invalid_count = int(row_counts[parsed.isna()].sum())
     return converted, invalid_count
 
 
+def _normalize_text(series):
+    """Trim and lowercase a text column; missing or 'nan' values become 'unknown'.
+
+    Uses Arrow string kernels when pyarrow is installed.
+
+    Returns:
+        pd.Categorical of the normalized values.
+    """
+    if _HAS_PYARROW:
+        arr = pa.array(series.astype("string"), type=pa.string())
+        arr = pc.utf8_lower(pc.utf8_trim_whitespace(arr))
+        arr = pc.if_else(pc.equal(arr, "nan"), "unknown", arr).fill_null("unknown")
+        return pd.Categorical(arr.to_numpy(zero_copy_only=False))
+
+    text = series.astype(str).str.strip().str.lower().where(series.notna(), "unknown")
+    return pd.Categorical(text.replace("nan", "unknown"))
+
+
+def _epoch_unit(series):
+    """Guess whether integer values are Unix epoch seconds or milliseconds.
+
+    Returns:
+        "s", "ms", or None when the values fall outside roughly 2001–2096.
+    """
+    values = series.dropna()
+    if values.empty:
+        return None
+    lo, hi = int(values.min()), int(values.max())
+    for unit, scale in (("s", 1), ("ms", 1_000)):
+        if _EPOCH_SECONDS_RANGE[0] * scale <= lo and hi <= _EPOCH_SECONDS_RANGE[1] * scale:
+            return unit
+    return None
+
+
 def _clean_numeric(series):
     """Strip currency symbols and convert to numeric.
 
+    Values that already parse are left alone; only the distinct strings
+    that fail get their currency symbols and whitespace stripped.
+
     Returns:
-        pd.Series of float64 values (with NaN for unconvertible).
+        pd.Series of numeric values (with NaN for unconvertible).
     """
-    # Convert to string, strip symbols
-    s = series.astype(str)
-    pattern = "[" + re.escape("".join(config.CURRENCY_SYMBOLS)) + r"\s]"
-    s = s.str.replace(pattern, "", regex=True)
-    # Handle common text values
-    s = s.replace({"nan": np.nan, "": np.nan, "none": np.nan, "null": np.nan})
-    return pd.to_numeric(s, errors="coerce")
+    numeric = pd.to_numeric(series, errors="coerce")
+    failed = numeric.isna() & series.notna()
+    if not failed.any():
+        return numeric
+
+    raw = series[failed].astype(str)
+    uniques = raw.unique()
+    if _HAS_PYARROW:
+        cleaned = pc.replace_substring_regex(
+            pa.array(uniques, type=pa.string()), pattern=_NUMERIC_STRIP_PATTERN, replacement=""
+        ).to_pylist()
+    else:
+        cleaned = [u.translate(_NUMERIC_STRIP) for u in uniques]
+    stripped = dict(zip(uniques, cleaned))
+    numeric = numeric.astype(np.float64)
+    numeric.loc[failed] = pd.to_numeric(raw.map(stripped), errors="coerce")
+    return numeric
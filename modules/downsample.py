@@ -0,0 +1,53 @@
+"""
+downsample.py — Largest-Triangle-Three-Buckets (LTTB) Downsampling
+Thins long line series to a fixed point budget while keeping their visual shape.
+Pure function — no Streamlit calls.
+"""
+
+import numpy as np
+
+
+def lttb_indices(y, n_out, x=None):
+    """Pick the row positions to keep when drawing a line with n_out points.
+
+    Args:
+        y: 1-D array-like of y values.
+        n_out: Target number of points (first and last are always kept).
+        x: Optional 1-D numeric array-like of x values (defaults to positions).
+
+    Returns:
+        np.ndarray of ascending integer positions into the input.
+    """
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # n_out - 2 buckets spanning the points between the first and the last
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
@@ -0,0 +1,33 @@
+"""
+fingerprint.py — Cheap DataFrame Cache Keys
+Content fingerprints used to memoize the pure pipeline and analysis functions.
+Pure function — no Streamlit calls.
+"""
+
+import hashlib
+
+import pandas as pd
+
+
+def fingerprint(df):
+    """Return a hashable fingerprint of a DataFrame's shape, schema and content.
+
+    Every row is hashed (one vectorized pass) and the row hashes are
+    digested in order, so an edit or reorder anywhere in the frame changes
+    the key; this is far cheaper than the work it guards.
+
+    Args:
+        df: pandas DataFrame.
+
+    Returns:
+        tuple: (row count, column names, dtype names, content hash).
+    """
+    n = len(df)
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    content_hash = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+    return (
+        n,
+        tuple(df.columns),
+        tuple(str(dtype) for dtype in df.dtypes),
+        content_hash,
+    )
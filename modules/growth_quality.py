@@ -3,6 +3,7 @@ growth_quality.py — Growth Quality Diagnostics
 Analyzes new vs repeat customers, revenue concentration, growth quality.
 """
 
+import numpy as np
 import pandas as pd
 from config import safe_divide, safe_pct_change
 from modules import visualization as viz
@@ -26,34 +27,42 @@ def analyze(clean_df, monthly_df, kpis):
         return result
 
     # ─── New vs Repeat Customer Analysis ─────────────────────────────────
-    customer_first_month = (
-        clean_df.groupby("customer_id")["year_month"]
-        .min()
-        .reset_index()
-        .rename(columns={"year_month": "first_month"})
+    # An order is "New" when it falls in the customer's first purchase month
+    first_month = (
+        clean_df.groupby("customer_id", sort=False, observed=True)["year_month"]
+        .transform("min")
     )
-    merged = clean_df.merge(customer_first_month, on="customer_id", how="left")
-    merged["customer_type"] = merged.apply(
-        lambda r: "New" if r["year_month"] == r["first_month"] else "Repeat",
-        axis=1,
+    # Compare Period ordinals directly; no aligned Series comparison
+    is_new = clean_df["year_month"].array.asi8 == first_month.array.asi8
+    customer_type = pd.Series(
+        np.where(is_new, "New", "Repeat"), index=clean_df.index, name="customer_type"
     )
 
     # Monthly new vs repeat
     monthly_type = (
-        merged.groupby(["year_month", "customer_type"])
+        clean_df.groupby(["year_month", customer_type], observed=True)
         .agg({"revenue": "sum", "customer_id": "nunique"})
         .reset_index()
         .rename(columns={"revenue": "total_revenue", "customer_id": "customers"})
     )
 
-    # KPIs
+    # KPIs — one per-customer count of repeat orders. Every customer has a
+    # new order in their first month, so each group counts as new; any
+    # order after the first month also counts the customer as repeat.
     total_customers = kpis.get("unique_customers", 0)
-    new_count = int(merged[merged["customer_type"] == "New"]["customer_id"].nunique())
-    repeat_count = int(merged[merged["customer_type"] == "Repeat"]["customer_id"].nunique())
+    repeat_orders = (
+        pd.Series(~is_new, index=clean_df.index)
+        .groupby(clean_df["customer_id"], sort=False, observed=True)
+        .sum()
+    )
+    new_count = len(repeat_orders)
+    repeat_count = int((repeat_orders > 0).sum())
     repeat_rate = round(safe_divide(repeat_count, total_customers) * 100, 1)
 
-    new_revenue = merged[merged["customer_type"] == "New"]["revenue"].sum()
-    repeat_revenue = merged[merged["customer_type"] == "Repeat"]["revenue"].sum()
+    # Revenue split rolled up from the monthly aggregate (no rescan)
+    type_revenue = monthly_type.groupby("customer_type")["total_revenue"].sum()
+    new_revenue = type_revenue.get("New", 0.0)
+    repeat_revenue = type_revenue.get("Repeat", 0.0)
     total_rev = new_revenue + repeat_revenue
     repeat_revenue_share = round(safe_divide(repeat_revenue, total_rev) * 100, 1)
 
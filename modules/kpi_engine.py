@@ -6,6 +6,8 @@ Pure function — no Streamlit calls.
 
 from config import safe_divide, safe_pct_change
 
+_SUM_COLUMNS = ["revenue", "cost", "marketing_spend"]
+
 
 def compute_kpis(clean_df, monthly_df):
     """Compute core KPIs from cleaned and aggregated data.
@@ -23,39 +25,43 @@ def compute_kpis(clean_df, monthly_df):
         return _empty_kpis()
 
     # ─── Revenue KPIs ────────────────────────────────────────────────────
-    kpis["total_revenue"] = round(clean_df["revenue"].sum(), 2)
-    kpis["total_orders"] = int(clean_df["order_id"].nunique()) if "order_id" in clean_df.columns else len(clean_df)
-    kpis["unique_customers"] = int(clean_df["customer_id"].nunique()) if "customer_id" in clean_df.columns else 0
+    # One reduction over all money columns; absent optional columns are skipped
+    sums = clean_df.reindex(columns=_SUM_COLUMNS).sum(numeric_only=True)
+    total_revenue = float(sums.get("revenue", 0.0))
+    total_orders = int(clean_df["order_id"].nunique()) if "order_id" in clean_df.columns else len(clean_df)
+    unique_customers = int(clean_df["customer_id"].nunique()) if "customer_id" in clean_df.columns else 0
+
+    kpis["total_revenue"] = round(total_revenue, 2)
+    kpis["total_orders"] = total_orders
+    kpis["unique_customers"] = unique_customers
 
     # ─── Averages ────────────────────────────────────────────────────────
-    kpis["avg_order_value"] = round(
-        safe_divide(kpis["total_revenue"], kpis["total_orders"]), 2
-    )
-    kpis["revenue_per_customer"] = round(
-        safe_divide(kpis["total_revenue"], kpis["unique_customers"]), 2
-    )
+    kpis["avg_order_value"] = round(safe_divide(total_revenue, total_orders), 2)
+    kpis["revenue_per_customer"] = round(safe_divide(total_revenue, unique_customers), 2)
 
     # ─── Latest & Previous Month ─────────────────────────────────────────
-    if len(monthly_df) >= 1:
-        kpis["latest_month"] = monthly_df.iloc[-1]["year_month"]
-        kpis["latest_month_revenue"] = round(monthly_df.iloc[-1]["total_revenue"], 2)
+    # Read the last two rows once instead of building a row Series per cell
+    latest = monthly_df[["year_month", "total_revenue"]].tail(2).to_numpy()
+    if len(latest) >= 1:
+        kpis["latest_month"] = str(latest[-1, 0])
+        kpis["latest_month_revenue"] = round(float(latest[-1, 1]), 2)
     else:
         kpis["latest_month"] = "N/A"
         kpis["latest_month_revenue"] = 0
 
-    if len(monthly_df) >= 2:
-        prev_rev = monthly_df.iloc[-2]["total_revenue"]
-        curr_rev = monthly_df.iloc[-1]["total_revenue"]
+    if len(latest) >= 2:
+        prev_rev = float(latest[-2, 1])
+        curr_rev = float(latest[-1, 1])
         kpis["mom_revenue_growth"] = round(safe_pct_change(curr_rev, prev_rev), 2)
     else:
         kpis["mom_revenue_growth"] = None  # Not enough data
 
     # ─── Cost & Margin (if available) ────────────────────────────────────
     if "cost" in clean_df.columns:
-        total_cost = clean_df["cost"].sum()
+        total_cost = float(sums["cost"])
         kpis["total_cost"] = round(total_cost, 2)
         kpis["gross_margin"] = round(
-            safe_divide(kpis["total_revenue"] - total_cost, kpis["total_revenue"]) * 100, 2
+            safe_divide(total_revenue - total_cost, total_revenue) * 100, 2
         )
     else:
         kpis["total_cost"] = None
@@ -63,19 +69,16 @@ def compute_kpis(clean_df, monthly_df):
 
     # ─── Marketing (if available) ────────────────────────────────────────
     if "marketing_spend" in clean_df.columns:
-        kpis["total_marketing_spend"] = round(clean_df["marketing_spend"].sum(), 2)
-        kpis["roas"] = round(
-            safe_divide(kpis["total_revenue"], kpis["total_marketing_spend"]), 2
-        )
+        total_spend = float(sums["marketing_spend"])
+        kpis["total_marketing_spend"] = round(total_spend, 2)
+        kpis["roas"] = round(safe_divide(total_revenue, total_spend), 2)
     else:
         kpis["total_marketing_spend"] = None
         kpis["roas"] = None
 
     # ─── Period Info ─────────────────────────────────────────────────────
     kpis["total_months"] = len(monthly_df)
-    kpis["orders_per_customer"] = round(
-        safe_divide(kpis["total_orders"], kpis["unique_customers"]), 2
-    )
+    kpis["orders_per_customer"] = round(safe_divide(total_orders, unique_customers), 2)
 
     return kpis
 
@@ -6,6 +6,9 @@ Pure function — no Streamlit calls.
 
 import config
 
+_STANDARD_COLUMNS = config.REQUIRED_COLUMNS + config.OPTIONAL_COLUMNS
+_SPACE_TO_UNDERSCORE = str.maketrans(" ", "_")
+
 
 def detect_and_map(df):
     """Detect and map columns to the standard schema using alias lists.
@@ -19,38 +22,73 @@ def detect_and_map(df):
             - mapping_report: dict of {standard_name: original_name}.
             - missing_required: list of required columns not found.
     """
+    columns, rename_map, mapping, missing_required = build_mapping(tuple(df.columns))
+    return apply_mapping(df, columns, rename_map), mapping, missing_required
+
+
+def build_mapping(columns):
+    """Work out the schema mapping from column names alone.
+
+    The result depends only on the names, so callers can memoize it on
+    tuple(df.columns) and reuse it across reruns.
+
+    Args:
+        columns: Tuple of raw column names.
+
+    Returns:
+        tuple: (normalized_columns, rename_map, mapping, missing_required)
+            - normalized_columns: list of normalized, de-duplicated names.
+            - rename_map: dict of {normalized_name: standard_name}.
+            - mapping: dict of {standard_name: original_name}.
+            - missing_required: list of required columns not found.
+    """
     # Step 1: Normalize column names
-    df = df.copy()
-    df.columns = [_normalize_col_name(c) for c in df.columns]
+    normalized = [_normalize_col_name(c) for c in columns]
 
     # Step 2: De-duplicate column names
-    df.columns = _deduplicate_columns(list(df.columns))
+    normalized = _deduplicate_columns(normalized)
+
+    # Step 3: Look up each column in the alias table
+    candidates = {}      # standard_name → [(alias_rank, column), ...]
+    for col in normalized:
+        for standard_col, rank in _ALIAS_LUT.get(col, ()):
+            candidates.setdefault(standard_col, []).append((rank, col))
 
-    # Step 3: Build mapping
-    all_standard = config.REQUIRED_COLUMNS + config.OPTIONAL_COLUMNS
+    # Step 4: Build mapping (earliest alias wins, each column used once)
     mapping = {}         # standard_name → original_name
     rename_map = {}      # original_name → standard_name (for df.rename)
 
-    for standard_col in all_standard:
-        aliases = config.COLUMN_ALIASES.get(standard_col, [standard_col])
-        for alias in aliases:
-            normalized_alias = _normalize_col_name(alias)
-            if normalized_alias in df.columns and normalized_alias not in rename_map:
-                mapping[standard_col] = normalized_alias
-                if normalized_alias != standard_col:
-                    rename_map[normalized_alias] = standard_col
+    for standard_col in _STANDARD_COLUMNS:
+        for _, col in sorted(candidates.get(standard_col, ())):
+            if col not in rename_map:
+                mapping[standard_col] = col
+                if col != standard_col:
+                    rename_map[col] = standard_col
                 break
 
-    # Step 4: Rename columns
-    if rename_map:
-        df = df.rename(columns=rename_map)
-
     # Step 5: Identify missing required columns
     missing_required = [
         col for col in config.REQUIRED_COLUMNS if col not in mapping
     ]
 
-    return df, mapping, missing_required
+    return normalized, rename_map, mapping, missing_required
+
+
+def apply_mapping(df, columns, rename_map):
+    """Apply a mapping from build_mapping() to a DataFrame.
+
+    Args:
+        df: Raw pandas DataFrame.
+        columns: Normalized column names (same order as df.columns).
+        rename_map: dict of {normalized_name: standard_name}.
+
+    Returns:
+        New DataFrame with standardized column names.
+    """
+    df = df.set_axis(columns, axis=1)
+    if rename_map:
+        df = df.rename(columns=rename_map, copy=False)
+    return df
 
 
 def format_mapping_report(mapping, missing_required):
@@ -84,7 +122,7 @@ def format_mapping_report(mapping, missing_required):
 
 def _normalize_col_name(name):
     """Normalize a column name: lowercase, strip, replace spaces with underscores."""
-    return str(name).strip().lower().replace(" ", "_")
+    return str(name).strip().lower().translate(_SPACE_TO_UNDERSCORE)
 
 
 def _deduplicate_columns(columns):
@@ -99,3 +137,17 @@ def _deduplicate_columns(columns):
             seen[col] = 0
             result.append(col)
     return result
+
+
+def _build_alias_lut():
+    """Map each normalized alias to the (standard_name, alias_rank) pairs it can fill."""
+    lut = {}
+    for standard_col in _STANDARD_COLUMNS:
+        aliases = config.COLUMN_ALIASES.get(standard_col, [standard_col])
+        for rank, alias in enumerate(aliases):
+            lut.setdefault(_normalize_col_name(alias), []).append((standard_col, rank))
+    return lut
+
+
+# Built once at import so mapping is a dict lookup per column
+_ALIAS_LUT = _build_alias_lut()
@@ -3,10 +3,14 @@ seasonality.py — MoM / Seasonal Pattern Detection
 Analyzes month-over-month changes and seasonal trends.
 """
 
+import numpy as np
 import pandas as pd
-from config import safe_pct_change
 from modules import visualization as viz
 
+_DAY_NAMES = np.array(
+    ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+)
+
 
 def analyze(clean_df, monthly_df, kpis):
     """Analyze seasonality and month-over-month patterns.
@@ -28,13 +32,16 @@ def analyze(clean_df, monthly_df, kpis):
         return result
 
     # ─── MoM Growth ──────────────────────────────────────────────────────
-    mom_df = monthly_df.copy()
-    mom_df["prev_revenue"] = mom_df["total_revenue"].shift(1)
-    mom_df["mom_growth"] = mom_df.apply(
-        lambda r: round(safe_pct_change(r["total_revenue"], r["prev_revenue"]), 1)
-        if pd.notna(r["prev_revenue"]) else None,
-        axis=1,
-    )
+    # Same rule as safe_pct_change: 0% when the previous month is 0
+    rev = monthly_df["total_revenue"].to_numpy(dtype=np.float64)
+    prev = np.empty_like(rev)
+    prev[0] = np.nan
+    prev[1:] = rev[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mom = np.where(prev != 0, (rev - prev) / prev * 100.0, 0.0)
+    mom[0] = np.nan
+    mom = np.round(mom, 1)
+    mom_df = monthly_df.assign(prev_revenue=prev, mom_growth=mom)
 
     # Drop first row (no previous month)
     mom_valid = mom_df.dropna(subset=["mom_growth"])
@@ -42,12 +49,12 @@ def analyze(clean_df, monthly_df, kpis):
     # ─── KPIs ────────────────────────────────────────────────────────────
     if not mom_valid.empty:
         avg_mom = round(mom_valid["mom_growth"].mean(), 1)
-        best_idx = mom_valid["mom_growth"].idxmax()
-        worst_idx = mom_valid["mom_growth"].idxmin()
-        best_month = mom_valid.loc[best_idx, "year_month"]
-        worst_month = mom_valid.loc[worst_idx, "year_month"]
-        best_growth = mom_valid.loc[best_idx, "mom_growth"]
-        worst_growth = mom_valid.loc[worst_idx, "mom_growth"]
+        best_pos = int(np.nanargmax(mom))
+        worst_pos = int(np.nanargmin(mom))
+        best_month = mom_df["year_month"].iloc[best_pos]
+        worst_month = mom_df["year_month"].iloc[worst_pos]
+        best_growth = mom[best_pos]
+        worst_growth = mom[worst_pos]
 
         result["kpis"] = [
             {"label": "Avg MoM Growth", "value": f"{avg_mom}%", "delta": None},
@@ -87,20 +94,19 @@ def analyze(clean_df, monthly_df, kpis):
 
     # ─── Day-of-Week Pattern (if daily data available) ───────────────────
     if "date" in clean_df.columns:
-        dow_df = clean_df.copy()
-        dow_df["day_of_week"] = dow_df["date"].dt.day_name()
-        dow_summary = (
-            dow_df.groupby("day_of_week")
-            .agg({"revenue": "sum", "order_id": "count"})
-            .reset_index()
-            .rename(columns={"revenue": "total_revenue", "order_id": "total_orders"})
-        )
-        # Sort by weekday order
-        day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        dow_summary["day_of_week"] = pd.Categorical(
-            dow_summary["day_of_week"], categories=day_order, ordered=True
-        )
-        dow_summary = dow_summary.sort_values("day_of_week")
+        # Integer weekdays (Monday=0) binned directly; labels only at the end
+        dow_ix = clean_df["date"].dt.dayofweek.to_numpy()
+        revenue = clean_df["revenue"].to_numpy(dtype=np.float64, na_value=0.0)
+        order_counts = np.bincount(dow_ix, minlength=7)
+        rev_sums = np.bincount(dow_ix, weights=revenue, minlength=7)
+
+        # Already in weekday order; days with no orders are left out
+        present = order_counts > 0
+        dow_summary = pd.DataFrame({
+            "day_of_week": _DAY_NAMES[present],
+            "total_revenue": rev_sums[present],
+            "total_orders": order_counts[present],
+        })
 
         result["charts"].append(
             viz.bar_chart(
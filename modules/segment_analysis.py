@@ -6,7 +6,6 @@ Analyzes revenue, orders, and customers by segment.
 import pandas as pd
 from config import safe_divide
 from modules import visualization as viz
-from modules import aggregation
 
 
 def analyze(clean_df, monthly_df, kpis):
@@ -29,12 +28,33 @@ def analyze(clean_df, monthly_df, kpis):
     total_revenue = kpis.get("total_revenue", 0)
     segments_found = []
 
-    # ─── Process each segment type ───────────────────────────────────────
-    for seg_col in ["channel", "region", "category"]:
-        if seg_col not in clean_df.columns:
-            continue
+    # ─── One pass over clean_df, then long form on the small result ──────
+    # Revenue is pre-aggregated per (month, channel, region, category) so
+    # the melt and every later groupby run on that frame, not on each row.
+    seg_cols = [c for c in ["channel", "region", "category"] if c in clean_df.columns]
+    if seg_cols:
+        monthly_seg = (
+            clean_df.groupby(["year_month", *seg_cols], sort=False, observed=True)["revenue"]
+            .sum()
+            .reset_index()
+        )
+        long_df = monthly_seg.melt(
+            id_vars=["year_month", "revenue"], value_vars=seg_cols,
+            var_name="segment_type", value_name="segment",
+        )
+        summary = (
+            long_df.groupby(["segment_type", "segment"], sort=False, observed=True)["revenue"]
+            .sum()
+            .reset_index()
+            .rename(columns={"revenue": "total_revenue"})
+        )
 
-        seg_df = aggregation.build_segment_summary(clean_df, seg_col)
+    # ─── Process each segment type ───────────────────────────────────────
+    for seg_col in seg_cols:
+        seg_df = (
+            summary[summary["segment_type"] == seg_col]
+            .sort_values(["total_revenue", "segment"], ascending=[False, True], ignore_index=True)
+        )
         if seg_df.empty:
             continue
 
@@ -71,11 +91,13 @@ def analyze(clean_df, monthly_df, kpis):
             )
 
     # ─── Segment by Channel over Time (if available) ─────────────────────
-    if "channel" in clean_df.columns:
+    if "channel" in seg_cols:
         monthly_channel = (
-            clean_df.groupby(["year_month", "channel"])
+            long_df[long_df["segment_type"] == "channel"]
+            .groupby(["year_month", "segment"], observed=True)
             .agg({"revenue": "sum"})
             .reset_index()
+            .rename(columns={"segment": "channel"})
         )
         if not monthly_channel.empty:
             result["charts"].append(
@@ -3,8 +3,8 @@ unit_economics.py — Unit Economics Analysis
 Analyzes AOV trends, revenue per customer, cost ratios, margins.
 """
 
+import numpy as np
 import pandas as pd
-from config import safe_divide
 from modules import visualization as viz
 
 
@@ -51,11 +51,12 @@ def analyze(clean_df, monthly_df, kpis):
     )
 
     # ─── Revenue per Customer Trend ──────────────────────────────────────
-    monthly_rpc = monthly_df.copy()
-    monthly_rpc["rev_per_customer"] = monthly_rpc.apply(
-        lambda r: round(safe_divide(r["total_revenue"], r["unique_customers"]), 2),
-        axis=1,
+    revenue = monthly_df["total_revenue"].to_numpy(dtype=np.float64)
+    customers = monthly_df["unique_customers"].to_numpy(dtype=np.float64)
+    rpc_values = np.divide(
+        revenue, customers, out=np.zeros_like(revenue), where=customers != 0
     )
+    monthly_rpc = monthly_df.assign(rev_per_customer=np.round(rpc_values, 2))
     result["charts"].append(
         viz.line_chart(
             monthly_rpc, x="year_month", y="rev_per_customer",
@@ -66,13 +67,11 @@ def analyze(clean_df, monthly_df, kpis):
 
     # ─── Margin Trend (if cost data available) ───────────────────────────
     if "total_cost" in monthly_df.columns:
-        margin_df = monthly_df.copy()
-        margin_df["margin_pct"] = margin_df.apply(
-            lambda r: round(
-                safe_divide(r["total_revenue"] - r["total_cost"], r["total_revenue"]) * 100, 1
-            ),
-            axis=1,
+        cost = monthly_df["total_cost"].to_numpy(dtype=np.float64)
+        margin_values = np.divide(
+            revenue - cost, revenue, out=np.zeros_like(revenue), where=revenue != 0
         )
+        margin_df = monthly_df.assign(margin_pct=np.round(margin_values * 100, 1))
         result["charts"].append(
             viz.bar_chart(
                 margin_df, x="year_month", y="margin_pct",
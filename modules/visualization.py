@@ -4,57 +4,116 @@ Provides chart factory functions with consistent styling.
 Pure function — no Streamlit calls.
 """
 
+import functools
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 import config
+from modules.downsample import lttb_indices
+
+
+#  Shared Template 
+# Registered once at import: base template plus our size, margins, font and
+# colorway, so each figure only carries its own title/axis labels.
+_TEMPLATE = "ecgi"
+pio.templates[_TEMPLATE] = go.layout.Template(pio.templates[config.CHART_TEMPLATE])
+pio.templates[_TEMPLATE].layout.update(
+    height=config.CHART_HEIGHT,
+    margin=dict(l=40, r=20, t=50, b=40),
+    font=dict(size=12),
+    autosize=True,
+    colorway=config.CHART_COLORS,
+)
+
+# Per-figure layout shared by every chart (read-only; the rest is in _TEMPLATE)
+_BASE_LAYOUT = MappingProxyType({"template": _TEMPLATE})
+
+# Validated once; Plotly copies it into each empty figure
+_EMPTY_ANNOTATION = go.layout.Annotation(
+    text="Not enough data to display",
+    xref="paper", yref="paper",
+    x=0.5, y=0.5, showarrow=False,
+    font=dict(size=16, color="gray"),
+)
 
 
 def line_chart(df, x, y, title, y_label="", color=None):
     """Create a Plotly line chart.
 
+    Single-column series longer than config.MAX_LINE_POINTS are
+    LTTB-downsampled (per color group) before plotting.
+
     Args:
-        df: DataFrame with the data.
-        x: Column name for x-axis.
-        y: Column name (or list) for y-axis.
+        df: DataFrame with the data (None when x and y are arrays).
+        x: Column name for x-axis, or a 1-D array of x values.
+        y: Column name (or list) for y-axis, or a 1-D NumPy array.
         title: Chart title.
         y_label: Optional y-axis label.
-        color: Optional column for color grouping.
+        color: Optional column for color grouping (column-name input only).
 
     Returns:
         plotly.graph_objects.Figure
     """
+    if isinstance(y, np.ndarray):
+        return _line_from_arrays(x, y, title, y_label)
+
     if df.empty:
         return _empty_chart(title)
 
-    if color:
-        fig = px.line(df, x=x, y=y, color=color, title=title,
-                      color_discrete_sequence=config.CHART_COLORS)
+    if isinstance(y, str) and len(df) > config.MAX_LINE_POINTS:
+        df = _downsample(df, x, y, color)
+
+    df = _plottable(df)
+    if isinstance(y, str):
+        lines = [(name, group, y) for name, group in _color_groups(df, color)]
     else:
-        fig = px.line(df, x=x, y=y, title=title,
-                      color_discrete_sequence=config.CHART_COLORS)
+        # Wide form: one line per y column, named after the column
+        lines = [(col, df, col) for col in y]
 
-    fig.update_layout(**_base_layout(y_label))
+    fig = go.Figure()
+    for name, group, y_col in lines:
+        fig.add_trace(go.Scatter(
+            x=group[x].to_numpy(), y=group[y_col].to_numpy(), mode="lines", name=name,
+            showlegend=name is not None,
+            hovertemplate=_hover(x, y_col, color if isinstance(y, str) else None, name),
+        ))
+
+    wide = not isinstance(y, str)
+    fig.update_layout(title=title, xaxis_title=x,
+                      legend_title_text="variable" if wide else color,
+                      **_base_layout(y_label or ("value" if wide else y)))
     return fig
 
 
 def bar_chart(df, x, y, title, y_label="", horizontal=False):
     """Create a Plotly bar chart.
 
+    x and y may also be 1-D arrays (with df=None), skipping the DataFrame.
+
     Returns:
         plotly.graph_objects.Figure
     """
-    if df.empty:
+    if isinstance(y, np.ndarray):
+        x_vals, y_vals, x, y = _plottable_values(x), y, "x", "y"
+    else:
+        if df.empty:
+            return _empty_chart(title)
+        df = _plottable(df)
+        x_vals, y_vals = df[x].to_numpy(), df[y].to_numpy()
+
+    if len(y_vals) == 0:
         return _empty_chart(title)
 
-    orientation = "h" if horizontal else "v"
     if horizontal:
-        fig = px.bar(df, x=y, y=x, title=title, orientation="h",
-                     color_discrete_sequence=config.CHART_COLORS)
+        fig = go.Figure(go.Bar(x=y_vals, y=x_vals, orientation="h",
+                               hovertemplate=_hover(y, x)))
+        fig.update_layout(title=title, xaxis_title=y, **_base_layout(y_label or x))
     else:
-        fig = px.bar(df, x=x, y=y, title=title,
-                     color_discrete_sequence=config.CHART_COLORS)
-
-    fig.update_layout(**_base_layout(y_label))
+        fig = go.Figure(go.Bar(x=x_vals, y=y_vals, hovertemplate=_hover(x, y)))
+        fig.update_layout(title=title, xaxis_title=x, **_base_layout(y_label or y))
     return fig
 
 
@@ -67,9 +126,14 @@ def stacked_bar(df, x, y, color, title, y_label=""):
     if df.empty:
         return _empty_chart(title)
 
-    fig = px.bar(df, x=x, y=y, color=color, title=title, barmode="stack",
-                 color_discrete_sequence=config.CHART_COLORS)
-    fig.update_layout(**_base_layout(y_label))
+    df = _plottable(df)
+    fig = go.Figure([
+        go.Bar(x=group[x].to_numpy(), y=group[y].to_numpy(), name=name,
+               hovertemplate=_hover(x, y, color, name))
+        for name, group in _color_groups(df, color)
+    ])
+    fig.update_layout(title=title, barmode="stack", xaxis_title=x,
+                      legend_title_text=color, **_base_layout(y_label or y))
     return fig
 
 
@@ -82,9 +146,12 @@ def pie_chart(df, names, values, title):
     if df.empty:
         return _empty_chart(title)
 
-    fig = px.pie(df, names=names, values=values, title=title,
-                 color_discrete_sequence=config.CHART_COLORS)
-    fig.update_layout(**_base_layout())
+    df = _plottable(df)
+    fig = go.Figure(go.Pie(
+        labels=df[names].to_numpy(), values=df[values].to_numpy(),
+        hovertemplate=f"{names}=%{{label}}<br>{values}=%{{value}}<extra></extra>",
+    ))
+    fig.update_layout(title=title, **_base_layout())
     return fig
 
 
@@ -101,11 +168,18 @@ def heatmap(z_values, x_labels, y_labels, title, color_label=""):
     Returns:
         plotly.graph_objects.Figure
     """
+    # One contiguous float array; the color range is fixed here rather
+    # than recomputed by Plotly from the data
+    z = np.ascontiguousarray(z_values, dtype=np.float64)
+    finite = z[np.isfinite(z)]
+    z_range = {"zmin": float(finite.min()), "zmax": float(finite.max())} if finite.size else {}
     fig = go.Figure(data=go.Heatmap(
-        z=z_values,
+        z=z,
         x=x_labels,
         y=y_labels,
         colorscale="Blues",
+        zsmooth=False,
+        **z_range,
         colorbar_title=color_label,
         hoverongaps=False,
     ))
@@ -116,6 +190,9 @@ def heatmap(z_values, x_labels, y_labels, title, color_label=""):
 def multi_line_chart(df, x, y_columns, title, y_label=""):
     """Create a multi-line chart with several y-columns.
 
+    Lines longer than config.MAX_LINE_POINTS are LTTB-downsampled
+    independently before plotting.
+
     Args:
         df: DataFrame.
         x: Column name for x-axis.
@@ -128,12 +205,20 @@ def multi_line_chart(df, x, y_columns, title, y_label=""):
     if df.empty:
         return _empty_chart(title)
 
+    x_num = _numeric_x(df[x]) if len(df) > config.MAX_LINE_POINTS else None
+    df = _plottable(df)
+    x_vals = df[x].to_numpy()
     fig = go.Figure()
     for i, col in enumerate(y_columns):
         if col in df.columns:
             color = config.CHART_COLORS[i % len(config.CHART_COLORS)]
+            line_x, line_y = x_vals, df[col].to_numpy()
+            if len(df) > config.MAX_LINE_POINTS:
+                # Each line keeps its own LTTB points
+                idx = lttb_indices(line_y, config.MAX_LINE_POINTS, x=x_num)
+                line_x, line_y = line_x[idx], line_y[idx]
             fig.add_trace(go.Scatter(
-                x=df[x], y=df[col], mode="lines+markers",
+                x=line_x, y=line_y, mode="lines+markers",
                 name=col.replace("_", " ").title(),
                 line=dict(color=color, width=2),
             ))
@@ -157,41 +242,97 @@ def format_number(value, prefix="", suffix="", decimals=0):
     if value is None:
         return "N/A"
     try:
-        if decimals == 0:
-            formatted = f"{int(value):,}"
-        else:
-            formatted = f"{value:,.{decimals}f}"
-        return f"{prefix}{formatted}{suffix}"
+        fmt = _number_formatter(decimals, prefix, suffix)
+        return fmt(int(value) if decimals == 0 else value)
     except (ValueError, TypeError):
         return "N/A"
 
 
+@functools.lru_cache(maxsize=32)
+def _number_formatter(decimals, prefix, suffix):
+    """Bound str.format for one (decimals, prefix, suffix) combination."""
+    spec = "{:,d}" if decimals == 0 else "{:,.%df}" % decimals
+    # Braces in the affixes are literal text, not format fields
+    prefix, suffix = (t.replace("{", "{{").replace("}", "}}") for t in (prefix, suffix))
+    return (prefix + spec + suffix).format
+
+
+def _line_from_arrays(x, y, title, y_label=""):
+    """line_chart() for 1-D x / y arrays: no DataFrame, same downsampling."""
+    if len(y) == 0:
+        return _empty_chart(title)
+
+    x_vals = _plottable_values(x)
+    if len(y) > config.MAX_LINE_POINTS:
+        idx = lttb_indices(y, config.MAX_LINE_POINTS, x=_numeric_x(x))
+        x_vals, y = x_vals[idx], y[idx]
+
+    fig = go.Figure(go.Scatter(x=x_vals, y=y, mode="lines", showlegend=False,
+                               hovertemplate=_hover("x", "y")))
+    fig.update_layout(title=title, xaxis_title="x", **_base_layout(y_label or "y"))
+    return fig
+
+
+def _downsample(df, x, y, color=None):
+    """LTTB-downsample each line (one per color group) to MAX_LINE_POINTS rows."""
+    groups = [df] if color is None else [g for _, g in df.groupby(color, sort=False, observed=True)]
+    keep = []
+    for g in groups:
+        idx = lttb_indices(g[y].to_numpy(), config.MAX_LINE_POINTS, x=_numeric_x(g[x]))
+        keep.append(g.index.to_numpy()[idx])
+    return df.loc[np.sort(np.concatenate(keep))]
+
+
+def _numeric_x(x_vals):
+    """x positions for LTTB: datetimes as int64 ns, numbers as-is, else None (row order)."""
+    if pd.api.types.is_datetime64_any_dtype(x_vals):
+        return np.asarray(x_vals).astype("datetime64[ns]").astype("int64")
+    if pd.api.types.is_numeric_dtype(x_vals):
+        return np.asarray(x_vals)
+    return None
+
+
+def _plottable_values(values):
+    """1-D x values as a NumPy array, with Periods rendered as strings."""
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return values
+    # Object input may hold Period objects; pd.array infers a PeriodArray
+    arr = values.array if isinstance(values, (pd.Series, pd.Index)) else pd.array(values)
+    if isinstance(arr.dtype, pd.PeriodDtype):
+        return np.asarray(arr.astype(str))
+    return np.asarray(values)
+
+
+def _color_groups(df, color):
+    """(name, rows) per color value in order of first appearance; one unnamed group if no color."""
+    if not color:
+        return [(None, df)]
+    return [(str(key), group) for key, group in df.groupby(color, sort=False, observed=True)]
+
+
+def _hover(x, y, color=None, name=None):
+    """Hover template in plotly-express style, e.g. 'year_month=%{x}<br>revenue=%{y}'."""
+    prefix = f"{color}={name}<br>" if color else ""
+    return f"{prefix}{x}=%{{x}}<br>{y}=%{{y}}<extra></extra>"
+
+
+def _plottable(df):
+    """Render Period columns (e.g. year_month) as 'YYYY-MM' strings for Plotly."""
+    period_cols = [c for c in df.columns if isinstance(df[c].dtype, pd.PeriodDtype)]
+    if not period_cols:
+        return df
+    return df.assign(**{c: df[c].astype(str) for c in period_cols})
+
+
 def _base_layout(y_label=""):
     """Return common layout settings for charts."""
-    layout = {
-        "template": config.CHART_TEMPLATE,
-        "height": config.CHART_HEIGHT,
-        "margin": dict(l=40, r=20, t=50, b=40),
-        "font": dict(size=12),
-        "autosize": True,
-    }
     if y_label:
-        layout["yaxis_title"] = y_label
-    return layout
+        return {**_BASE_LAYOUT, "yaxis_title": y_label}
+    return _BASE_LAYOUT
 
 
 def _empty_chart(title):
     """Return an empty chart with a 'No data' message."""
     fig = go.Figure()
-    fig.update_layout(
-        title=title,
-        template=config.CHART_TEMPLATE,
-        height=config.CHART_HEIGHT,
-        annotations=[dict(
-            text="Not enough data to display",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="gray"),
-        )],
-    )
+    fig.update_layout(title=title, annotations=[_EMPTY_ANNOTATION], **_BASE_LAYOUT)
     return fig
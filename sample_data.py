@@ -1,7 +1,8 @@
 """
 sample_data.py — Built-in Sample Dataset Generator
 Generates a realistic 12-month, 1000-order e-commerce dataset.
-Cached to avoid regeneration on every Streamlit rerun.
+Cached to avoid regeneration on every Streamlit rerun, and persisted to
+disk so a restarted app loads it instead of rebuilding it.
 """
 
 import pandas as pd
@@ -9,15 +10,24 @@ import numpy as np
 import streamlit as st
 
 
-@st.cache_data
+@st.cache_resource
 def generate():
     """Generate a realistic sample e-commerce dataset.
 
+    The frame is a process-wide shared instance — callers must not mutate it.
+
     Returns:
         pd.DataFrame with columns: date, order_id, customer_id, revenue,
         cost, channel, region, category, device, marketing_spend.
     """
-    np.random.seed(42)
+    return _build()
+
+
+@st.cache_data(persist="disk", show_spinner=False, max_entries=1)
+def _build():
+    """Build the sample dataset; pickled to disk, so cold starts just unpickle it."""
+    # One PCG64 generator for every column (no global legacy RNG state)
+    rng = np.random.default_rng(42)
     n_orders = 1000
     n_customers = 300
 
@@ -25,19 +35,24 @@ def generate():
     start_date = pd.Timestamp("2024-01-01")
     end_date = pd.Timestamp("2024-12-31")
     date_range_days = (end_date - start_date).days
-    random_days = np.random.randint(0, date_range_days + 1, size=n_orders)
-    dates = [start_date + pd.Timedelta(days=int(d)) for d in random_days]
+    # Drawn pre-sorted so rows come out in date order (other columns are
+    # independent per row, so no frame-wide sort is needed)
+    random_days = np.sort(rng.integers(0, date_range_days + 1, size=n_orders))
+    dates = start_date.to_datetime64() + random_days.astype("timedelta64[D]")
 
     # Customer IDs — ~300 unique (repeat buyers)
-    customer_ids = [f"CUST-{i:04d}" for i in range(1, n_customers + 1)]
-    assigned_customers = np.random.choice(customer_ids, size=n_orders)
+    # Stored as codes into the 300 ids
+    customer_ids = _zero_padded_ids("CUST-", n_customers)
+    assigned_customers = pd.Categorical.from_codes(
+        rng.integers(0, n_customers, size=n_orders), categories=customer_ids
+    )
 
     # Revenue — normal distribution, mean ₹1500, std ₹500, clipped > 100
-    revenue = np.random.normal(loc=1500, scale=500, size=n_orders)
+    revenue = rng.normal(loc=1500, scale=500, size=n_orders)
     revenue = np.clip(revenue, 100, None).round(2)
 
     # Cost — 60-80% of revenue
-    cost_ratio = np.random.uniform(0.60, 0.80, size=n_orders)
+    cost_ratio = rng.uniform(0.60, 0.80, size=n_orders)
     cost = (revenue * cost_ratio).round(2)
 
     # Categorical columns
@@ -46,10 +61,15 @@ def generate():
     categories = ["Electronics", "Fashion", "Home", "Beauty"]
     devices = ["Mobile", "Desktop", "Tablet"]
 
-    channel_picks = np.random.choice(channels, size=n_orders)
-    region_picks = np.random.choice(regions, size=n_orders)
-    category_picks = np.random.choice(categories, size=n_orders)
-    device_picks = np.random.choice(devices, size=n_orders, p=[0.55, 0.35, 0.10])
+    # Low-cardinality columns are stored as categoricals (int8 codes)
+    channel_picks = pd.Categorical(rng.choice(channels, size=n_orders), categories=channels)
+    region_picks = pd.Categorical(rng.choice(regions, size=n_orders), categories=regions)
+    category_picks = pd.Categorical(
+        rng.choice(categories, size=n_orders), categories=categories
+    )
+    device_picks = pd.Categorical(
+        rng.choice(devices, size=n_orders, p=[0.55, 0.35, 0.10]), categories=devices
+    )
 
     # Marketing spend correlated with channel
     channel_spend_map = {
@@ -59,14 +79,16 @@ def generate():
         "Email": (2, 15),
         "Referral": (10, 40),
     }
-    marketing_spend = np.array([
-        round(np.random.uniform(*channel_spend_map[ch]), 2)
-        for ch in channel_picks
-    ])
+    # Per-row bounds by fancy-indexing channel codes; one vectorized draw
+    spend_low, spend_high = np.array([channel_spend_map[ch] for ch in channels]).T
+    channel_codes = channel_picks.codes
+    marketing_spend = rng.uniform(
+        spend_low[channel_codes], spend_high[channel_codes]
+    ).round(2)
 
     df = pd.DataFrame({
         "date": dates,
-        "order_id": [f"ORD-{i:04d}" for i in range(1, n_orders + 1)],
+        "order_id": _zero_padded_ids("ORD-", n_orders),
         "customer_id": assigned_customers,
         "revenue": revenue,
         "cost": cost,
@@ -77,7 +99,9 @@ def generate():
         "marketing_spend": marketing_spend,
     })
 
-    # Sort by date for time-series consistency
-    df = df.sort_values("date").reset_index(drop=True)
-
     return df
+
+
+def _zero_padded_ids(prefix, n):
+    """Return prefix + 1..n zero-padded to 4 digits, e.g. "ORD-0001"."""
+    return np.char.add(prefix, np.char.zfill(np.arange(1, n + 1).astype(str), 4))